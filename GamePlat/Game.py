@@ -1,13 +1,20 @@
 import pgzrun
+import pygame
 from pygame import Rect
 import math
+from collections import OrderedDict
+import numpy as np
+from hero_batch import HeroBatch, LevelGeometry
+from settings import (
+    WIDTH, HEIGHT, TILE_SIZE, HERO_WIDTH, HERO_HEIGHT, HERO_JUMP_POWER,
+    HERO_GRAVITY, HERO_MAX_FALL_SPEED, HERO_SPEED, HERO_STOMP_BOUNCE, FALL_LIMIT,
+    JUMP_BUFFER_FRAMES, COYOTE_FRAMES, GOAL_WIDTH, GOAL_HEIGHT
+)
 
-# Configurações globais
-WIDTH, HEIGHT = 800, 600
+# Configurações globais (tela, grade, física e entrada do herói e tamanho da
+# bandeira vêm de settings.py, compartilhado com o gerador e a simulação em lote)
 TITLE = "GamePlat"  # Nome do jogo na janela
 FPS = 60
-TILE_SIZE = 32
-HERO_WIDTH, HERO_HEIGHT = 32, 32
 
 # Estados do jogo
 MENU, PLAYING, GAME_OVER, VICTORY, LEVEL_TRANSITION, LEVEL_SELECT = range(6)
@@ -28,6 +35,42 @@ MOVING_PROGRAMMATIC_COLORS = {
     "parede_tijolo": (139, 0, 0)   
 }
 
+# Partículas
+PARTICLE_CAPACITY = 4096 # Máximo de partículas vivas ao mesmo tempo
+PARTICLE_GRAVITY = 0.25
+PARTICLE_MAX_SIZE = 4 # Lado máximo (em pixels) do quadrado de cada partícula
+LANDING_DUST_MIN_SPEED = 4 # Velocidade de queda mínima para levantar poeira
+ENEMY_PARTICLE_COLORS = { # Cor da explosão de morte por tipo de inimigo
+    'zombie': (90, 160, 60),
+    'bat': (120, 60, 150),
+    'ice': (170, 220, 255)
+}
+DUST_COLOR, SPARK_COLOR = (190, 170, 140), (255, 220, 80)
+
+# Fundos com parallax: cada camada é (imagem, fator); fator 0 fica parado e
+# fator 1 acompanha a câmera por completo. A primeira camada é a de trás; as
+# seguintes precisam de PNG com transparência. Por enquanto só existe arte de
+# uma camada por fase, então LEVELS usa uma única camada cada
+MENU_BACKGROUND_LAYERS = [("backgrounds/menu_bg", 0.5)]
+MENU_SCROLL_SPEED = 1 # Deslocamento da câmera por frame no menu
+
+# Animações (compartilhadas entre instâncias e usadas para listar os recursos de cada fase)
+HERO_ANIMATION_FRAMES = {"idle": 4, "run": 6, "jump": 4}
+ENEMY_ANIMATION_DATA = { # Dados específicos de cada tipo de inimigo
+    'zombie': {'frames': 2, 'speed': 1, 'height': 32},
+    'bat': {'frames': 3, 'speed': 2, 'height': 32}, # Morcego pode ter comportamento aéreo
+    'ice': {'frames': 2, 'speed': 1.5, 'height': 32}
+}
+GOAL_ANIMATION_FRAMES = 2
+
+# Fantasmas (replays das melhores corridas)
+GHOST_REPLAY_LIMIT = 3 # Quantas corridas são guardadas (e exibidas) por fase
+GHOST_ALPHA = 110 # Transparência dos fantasmas (0 a 255)
+
+# Cache de recursos
+ASSET_CACHE_BUDGET = 64 * 1024 * 1024 # Orçamento de memória (bytes) para imagens e sons
+GAME_SOUNDS = ("jump", "hurt", "gameover", "enemy_death", "victory", "level_complete")
+
 
 def tocar_musica_com_feedback(nome_da_faixa, volume=0.5):
     """Toca uma faixa de música com feedback no console."""
@@ -78,6 +121,40 @@ class Button:
         self.is_hovered = self.rect.collidepoint(mouse_pos)
 
 
+class InputLatencyStats:
+    """Mede, em frames, o atraso entre apertar o pulo e o herói reagir na tela."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Zera as medições."""
+        self.samples, self.total_frames, self.max_frames = 0, 0, 0
+        self.dropped = 0 # Pulos que expiraram no buffer sem acontecer
+        self.histogram = [0] * JUMP_BUFFER_FRAMES # Índice = atraso em frames (o buffer limita o máximo)
+
+    def record(self, frames):
+        """Registra um pulo executado `frames` ticks depois de amostrado."""
+        self.samples += 1
+        self.total_frames += frames
+        self.max_frames = max(self.max_frames, frames)
+        self.histogram[frames] += 1
+
+    def record_dropped(self):
+        """Registra um pulo apertado que nunca aconteceu."""
+        self.dropped += 1
+
+    def summary(self):
+        """Resumo em texto para o HUD de depuração."""
+        average = self.total_frames / self.samples if self.samples else 0
+        distribution = " ".join( # Ex: "0f:12 1f:3 5f:1"
+            f"{frames}f:{count}" for frames, count in enumerate(self.histogram) if count
+        )
+        return (f"Latência do pulo: média {average:.2f} frames, "
+                f"máx {self.max_frames}, perdidos {self.dropped} "
+                f"[{distribution or 'sem pulos'}]")
+
+
 class Hero:
     """Representa o personagem principal do jogo."""
 
@@ -87,33 +164,46 @@ class Hero:
         self.current_frame = 0
         self.animation_time = 0
         self.invincible_timer = 0
-        self.jump_power = -15 # Força do pulo
-        self.speed = 5 # Velocidade de movimento horizontal
+        self.jump_power = HERO_JUMP_POWER # Força do pulo
+        self.speed = HERO_SPEED # Velocidade de movimento horizontal
         self.facing = 1  # 1 para direita, -1 para esquerda
         self.on_ground = False # Está no chão?
         self.invincible = False # Está invencível?
         # Contagem de frames para cada animação
-        self.animation_frames = {"idle": 4, "run": 6, "jump": 4}
+        self.animation_frames = HERO_ANIMATION_FRAMES
         self.state = "idle" # Estado inicial
         self.health = 3 # Vida inicial
+        self.jump_buffer = 0 # Frames restantes de um pulo apertado e ainda não executado
+        self.jump_buffer_age = 0 # Frames desde que o pulo em buffer foi amostrado
+        self.coyote_timer = 0 # Frames restantes de tolerância após sair do chão
+
+    def update(self, platforms, goal, controls):
+        """Atualiza a lógica do herói (movimento, física, colisão).
 
-    def update(self, platforms, goal):
-        """Atualiza a lógica do herói (movimento, física, colisão)."""
+        `controls` é a tupla (esquerda, direita, pulo_apertado) amostrada
+        uma única vez no início do tick por `sample_input`.
+        """
         global game_state
+        left, right, jump_pressed = controls
         if self.invincible: # Temporizador de invencibilidade
             self.invincible_timer -= 1
             if self.invincible_timer <= 0:
                 self.invincible = False
 
+        # Pulo apertado no chão sai antes da física, para a resposta aparecer neste mesmo frame
+        if jump_pressed:
+            self.jump_buffer, self.jump_buffer_age = JUMP_BUFFER_FRAMES, 0
+            self.jump()
+
         dx = 0 # Deslocamento horizontal
         previous_state = self.state # Para detectar mudança de estado e resetar animação
 
         # Movimento horizontal e definição de estado (run/idle)
-        if keyboard.left:
+        if left:
             self.facing, dx = -1, -self.speed
             if self.on_ground:
                 self.state = "run"
-        elif keyboard.right:
+        elif right:
             self.facing, dx = 1, self.speed
             if self.on_ground:
                 self.state = "run"
@@ -129,7 +219,7 @@ class Hero:
         self.rect.x += dx # Aplica movimento X
 
         # Física Vertical (Gravidade)
-        self.velocity = min(self.velocity + 0.6, 10) # Aplica gravidade, limita velocidade de queda
+        self.velocity = min(self.velocity + HERO_GRAVITY, HERO_MAX_FALL_SPEED) # Aplica gravidade, limita velocidade de queda
         self.rect.y += self.velocity # Aplica movimento Y
 
         previous_on_ground = self.on_ground # Guarda se estava no chão antes das colisões
@@ -150,11 +240,14 @@ class Hero:
                 )
 
                 if is_falling_on_top: # Se está caindo sobre uma plataforma
+                    landing_speed = self.velocity # Velocidade de queda no impacto
                     self.rect.bottom = p.rect.top # Ajusta posição para o topo da plataforma
                     self.velocity = 0 # Para a queda
                     self.on_ground = True # Marca que está no chão
                     if not previous_on_ground: # Se acabou de aterrissar
-                        self.state = "run" if keyboard.left or keyboard.right \
+                        if landing_speed >= LANDING_DUST_MIN_SPEED: # Ignora micro-quedas (ex: plataforma descendo)
+                            particles.dust(self.rect.midbottom) # Poeira da aterrissagem
+                        self.state = "run" if left or right \
                                      else "idle" # Define estado baseado no input
                         self.current_frame, self.animation_time = 0, 0 # Reseta animação
                 elif is_hitting_head: # Se está batendo a cabeça
@@ -164,31 +257,53 @@ class Hero:
                 # Se estiver em uma plataforma móvel e no chão, acompanha o movimento dela
                 if isinstance(p, MovingPlatform) and self.on_ground:
                     self.rect.x += p.speed * p.direction
+
+        # Coyote time: renova no chão e se esgota aos poucos no ar
+        if self.on_ground:
+            self.coyote_timer = COYOTE_FRAMES
+        elif self.coyote_timer > 0:
+            self.coyote_timer -= 1
+
+        # Pulo em buffer: tenta depois das colisões, para pular no mesmo tick em que aterrissa
+        if self.jump_buffer and not self.jump():
+            self.jump_buffer -= 1
+            self.jump_buffer_age += 1
+            if not self.jump_buffer: # Expirou sem encontrar chão
+                input_latency.record_dropped()
         
         # Define estado de pulo se estiver no ar
         if not self.on_ground and self.state != "jump":
             self.state, self.current_frame, self.animation_time = "jump", 0, 0
         # Se estava pulando e aterrisou sem input de movimento, volta para idle
         elif self.on_ground and self.state == "jump" and \
-                not (keyboard.left or keyboard.right):
+                not (left or right):
             self.state, self.current_frame, self.animation_time = "idle", 0, 0
 
         # Verifica se alcançou o objetivo
         return self.rect.colliderect(goal.rect) and goal.active
 
     def jump(self):
-        """Faz o herói pular se estiver no chão."""
-        if self.on_ground:
-            self.velocity = self.jump_power # Define velocidade vertical para o pulo
-            self.on_ground = False # Marca que não está mais no chão
-            if self.state != "jump": # Garante que a animação de pulo comece
-                self.state, self.current_frame, self.animation_time = \
-                    "jump", 0, 0
-            if sounds_enabled:
-                try:
-                    sounds.jump.play()
-                except Exception as e:
-                    print(f"ERRO som pulo: {e}")
+        """Faz o herói pular se estiver no chão ou no coyote time.
+
+        Devolve True se o pulo aconteceu.
+        """
+        if not (self.on_ground or self.coyote_timer > 0):
+            return False
+        self.velocity = self.jump_power # Define velocidade vertical para o pulo
+        self.on_ground = False # Marca que não está mais no chão
+        self.coyote_timer = 0 # Impede um segundo pulo no ar
+        if self.jump_buffer: # Pulo veio do buffer: mede o atraso desde a amostragem
+            input_latency.record(self.jump_buffer_age)
+            self.jump_buffer = 0
+        if self.state != "jump": # Garante que a animação de pulo comece
+            self.state, self.current_frame, self.animation_time = \
+                "jump", 0, 0
+        if sounds_enabled:
+            try:
+                assets.sound("jump").play()
+            except Exception as e:
+                print(f"ERRO som pulo: {e}")
+        return True
 
     def take_damage(self):
         """Processa o herói tomando dano."""
@@ -197,16 +312,17 @@ class Hero:
             return
         self.health -= 1
         self.invincible, self.invincible_timer = True, FPS * 2 # Ativa invencibilidade
+        particles.sparks(self.rect.center) # Faíscas do impacto
         if self.health <= 0: # Se a vida acabou
             game_state = GAME_OVER
             if sounds_enabled:
                 try: 
-                    sounds.gameover.play()
+                    assets.sound("gameover").play()
                 except Exception as e:
                     print(f"ERRO som gameover: {e}")
         elif sounds_enabled: # Se ainda tem vida, toca som de dano
             try: 
-                sounds.hurt.play()
+                assets.sound("hurt").play()
             except Exception as e:
                 print(f"ERRO som dano: {e}")
 
@@ -225,7 +341,7 @@ class Hero:
             return
         frame_image_name = f"hero/{self.state}_{self.current_frame}"
         try:
-            screen.blit(frame_image_name, self.rect.topleft)
+            screen.blit(assets.image(frame_image_name), self.rect.topleft)
         except Exception as e: # Fallback se a imagem não for encontrada
             print(f"!!! ERRO frame herói '{frame_image_name}': {e}")
             screen.draw.filled_rect(self.rect, RED)
@@ -238,11 +354,7 @@ class Enemy:
         self.rect = Rect(x, y, 32, 32) # Hitbox do inimigo
         self.patrol_start_x, self.patrol_range, self.type = \
             x, patrol_range, enemy_type
-        self.animation_data = { # Dados específicos de cada tipo de inimigo
-            'zombie': {'frames': 2, 'speed': 1, 'height': 32},
-            'bat': {'frames': 3, 'speed': 2, 'height': 32}, # Morcego pode ter comportamento aéreo
-            'ice': {'frames': 2, 'speed': 1.5, 'height': 32}
-        }
+        self.animation_data = ENEMY_ANIMATION_DATA
         self.rect.height = self.animation_data[self.type].get('height', 32) # Ajusta altura
         self.speed = self.animation_data[self.type]['speed']
         self.direction = -1 # Direção inicial (geralmente para a esquerda)
@@ -255,9 +367,10 @@ class Enemy:
         """Marca o inimigo como derrotado."""
         if self.alive:
             self.alive = False
+            particles.burst(self.rect.center, ENEMY_PARTICLE_COLORS.get(self.type, WHITE))
             if sounds_enabled:
                 try: 
-                    sounds.enemy_death.play()
+                    assets.sound("enemy_death").play()
                 except Exception as e:
                     print(f"ERRO som morte inimigo: {e}")
 
@@ -290,7 +403,7 @@ class Enemy:
         if self.alive:
             frame_image_name = f"enemies/{self.type}_{self.current_frame}"
             try:
-                screen.blit(frame_image_name, self.rect.topleft)
+                screen.blit(assets.image(frame_image_name), self.rect.topleft)
             except Exception as e: # Fallback se imagem não encontrada
                 print(f"!!! ERRO frame inimigo '{frame_image_name}': {e}")
                 screen.draw.filled_rect(self.rect, GREEN)
@@ -319,7 +432,7 @@ class Platform:
                     tile_y = self.rect.y + j_idx * TILE_SIZE
                     try:
                         # Tenta desenhar o tile da textura (ex: "images/tiles/plataforma_pedra.png")
-                        screen.blit(f"tiles/{self.texture_name}", (tile_x, tile_y))
+                        screen.blit(assets.image(f"tiles/{self.texture_name}"), (tile_x, tile_y))
                     except Exception: # Fallback se a imagem do tile não for encontrada
                         # Calcula a área visível do tile para não desenhar fora da plataforma
                         drawable_width = min(TILE_SIZE, self.rect.right - tile_x)
@@ -384,7 +497,7 @@ class Goal:
     """Representa o objetivo (bandeira) do nível."""
 
     def __init__(self, x, y):
-        self.rect = Rect(x, y, 32, 64)  # Hitbox do objetivo
+        self.rect = Rect(x, y, GOAL_WIDTH, GOAL_HEIGHT)  # Hitbox do objetivo
         self.active = True # Objetivo está ativo?
         self.animation_frame, self.animation_time = 0, 0 # Para animação da bandeira
 
@@ -393,7 +506,7 @@ class Goal:
         if self.active:
             self.animation_time += 1
             if self.animation_time >= 15:  # Velocidade da animação
-                self.animation_frame = (self.animation_frame + 1) % 2 # Alterna entre 2 frames
+                self.animation_frame = (self.animation_frame + 1) % GOAL_ANIMATION_FRAMES # Alterna entre os frames
                 self.animation_time = 0
 
     def draw(self):
@@ -401,11 +514,381 @@ class Goal:
         if self.active:
             try:
                 # Assume imagens "flags/flag_0.png" e "flags/flag_1.png"
-                screen.blit(f"flags/flag_{self.animation_frame}", self.rect.topleft)
+                screen.blit(assets.image(f"flags/flag_{self.animation_frame}"), self.rect.topleft)
             except Exception: # Fallback se imagem da bandeira não encontrada
                 screen.draw.filled_rect(self.rect, GREEN)
 
 
+class AssetCache:
+    """Cache LRU de imagens e sons com orçamento de memória.
+
+    Os recursos são carregados pelos loaders do Pygame Zero, mas retirados do
+    cache interno deles, para que só este cache os mantenha vivos. Cada chave
+    é ("image", nome), ("sound", nome) ou, para camadas de fundo já escaladas
+    e convertidas, ("layer", nome, tamanho da tela, opaca). Chaves retidas (contagem de
+    referências > 0) nunca são removidas; as demais são descartadas da menos
+    usada recentemente para a mais usada quando o orçamento é ultrapassado.
+    """
+
+    def __init__(self, budget_bytes=ASSET_CACHE_BUDGET):
+        self.budget_bytes = budget_bytes
+        self.entries = OrderedDict() # Chave -> (recurso, bytes), do menos ao mais recente
+        self.ref_counts = {} # Chave -> número de escopos (fases) que a usam
+        self.missing = set() # Chaves sem arquivo, resolvidas uma única vez
+        self.resident_bytes = 0
+        self.hits, self.misses, self.evictions, self.evicted_bytes = 0, 0, 0, 0
+
+    def image(self, name):
+        """Devolve a imagem `name` (ex: "hero/idle_0")."""
+        return self._get(("image", name), lambda: self._load(images, name))
+
+    def sound(self, name):
+        """Devolve o som `name` (ex: "jump")."""
+        return self._get(("sound", name), lambda: self._load(sounds, name))
+
+    def layer(self, name, opaque):
+        """Devolve a camada de fundo `name` já pronta para desenhar.
+
+        Só a versão escalada e convertida fica no cache; a imagem original é
+        descartada logo depois de preparada.
+        """
+        return self._get(self.layer_key(name, opaque), lambda: ParallaxBackground.prepare_layer(
+            self._load(images, name), opaque))
+
+    @staticmethod
+    def layer_key(name, opaque):
+        """Chave de uma camada de fundo preparada para o tamanho atual da tela."""
+        return ("layer", name, (WIDTH, HEIGHT), opaque)
+
+    @staticmethod
+    def _load(loader, name):
+        """Carrega pelo loader do Pygame Zero sem deixar cópia no cache dele."""
+        asset = loader.load(name)
+        loader.cache.pop(loader.cache_key(name, (), {}), None) # Só este cache guarda o recurso
+        return asset
+
+    def fetch(self, key):
+        """Devolve o recurso de qualquer chave do cache."""
+        if key[0] == "layer":
+            return self.layer(key[1], key[3])
+        return self.image(key[1]) if key[0] == "image" else self.sound(key[1])
+
+    def _get(self, key, load):
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self.entries.move_to_end(key) # Marca como usado recentemente
+            return entry[0]
+        if key in self.missing:
+            raise KeyError(f"Recurso '{key[1]}' não encontrado.")
+
+        self.misses += 1
+        try:
+            asset = load()
+        except Exception:
+            self.missing.add(key)
+            raise
+        nbytes = self.asset_size(asset)
+        self.entries[key] = (asset, nbytes)
+        self.resident_bytes += nbytes
+        self.evict()
+        return asset
+
+    @staticmethod
+    def asset_size(asset):
+        """Estimativa da memória ocupada por uma imagem ou som, em bytes."""
+        if isinstance(asset, pygame.Surface):
+            return asset.get_width() * asset.get_height() * asset.get_bytesize()
+        mixer_settings = pygame.mixer.get_init()
+        if mixer_settings and isinstance(asset, pygame.mixer.Sound):
+            frequency, sample_format, channels = mixer_settings
+            return int(asset.get_length() * frequency) * channels * (abs(sample_format) // 8)
+        return 0
+
+    def retain(self, keys):
+        """Incrementa a contagem de referências das chaves (protege da remoção)."""
+        for key in keys:
+            self.ref_counts[key] = self.ref_counts.get(key, 0) + 1
+
+    def release(self, keys):
+        """Decrementa a contagem de referências e remove o excesso, se houver."""
+        for key in keys:
+            count = self.ref_counts.get(key, 0) - 1
+            if count > 0:
+                self.ref_counts[key] = count
+            else:
+                self.ref_counts.pop(key, None)
+        self.evict()
+
+    def preload(self, keys):
+        """Carrega antecipadamente as chaves, ignorando as que não existem."""
+        for key in keys:
+            try:
+                self.fetch(key)
+            except Exception:
+                pass # Já registrado em self.missing; o desenho usa o fallback
+
+    def evict(self):
+        """Remove recursos não retidos, do menos recente, até caber no orçamento."""
+        if self.resident_bytes <= self.budget_bytes:
+            return
+        for key in list(self.entries):
+            if self.resident_bytes <= self.budget_bytes:
+                break
+            if self.ref_counts.get(key, 0) > 0: # Em uso pela fase atual ou pela próxima
+                continue
+            _, nbytes = self.entries.pop(key)
+            self.resident_bytes -= nbytes
+            self.evictions += 1
+            self.evicted_bytes += nbytes
+
+    def stats(self):
+        """Contadores do cache (para depuração e benchmarks)."""
+        return {
+            "hits": self.hits, "misses": self.misses,
+            "evictions": self.evictions, "evicted_bytes": self.evicted_bytes,
+            "resident_bytes": self.resident_bytes, "entries": len(self.entries)
+        }
+
+
+class ParallaxBackground:
+    """Fundo de várias camadas que rolam em velocidades diferentes (parallax).
+
+    As camadas vêm prontas do cache de recursos (escaladas para cobrir a tela,
+    sem distorcer, e convertidas para o formato do display). Camadas ausentes
+    são descartadas na criação, então o desenho nunca repete a busca.
+    """
+
+    def __init__(self, layer_specs, fallback_color=BLACK):
+        self.fallback_color = fallback_color
+        self.layers = [] # Lista de (superfície pronta, fator de parallax)
+        for index, (image_name, factor) in enumerate(layer_specs):
+            try:
+                # A camada de trás é opaca; as da frente precisam manter a transparência
+                surface = assets.layer(image_name, opaque=(index == 0))
+            except Exception: # Camada não encontrada: resolvida agora, ignorada depois
+                print(f"AVISO: Camada de fundo '{image_name}' não encontrada.")
+                continue
+            self.layers.append((surface, factor))
+
+    @staticmethod
+    def prepare_layer(surface, opaque):
+        """Escala a imagem por igual até cobrir a tela e corta o excesso vertical.
+
+        A largura nunca é cortada, para as bordas esquerda e direita da imagem
+        continuarem se encaixando quando a camada se repete.
+        """
+        width, height = surface.get_size()
+        scale = max(WIDTH / width, HEIGHT / height) # Cobre a tela sem distorcer
+        scaled_size = (max(WIDTH, math.ceil(width * scale)), max(HEIGHT, math.ceil(height * scale)))
+        if scaled_size != (width, height):
+            surface = pygame.transform.smoothscale(surface, scaled_size)
+        crop_top = (scaled_size[1] - HEIGHT) // 2 # Mantém o centro da imagem
+        surface = surface.subsurface((0, crop_top, scaled_size[0], HEIGHT))
+        return surface.convert() if opaque else surface.convert_alpha()
+
+    def draw(self, camera_x):
+        """Desenha as camadas deslocadas pela câmera, com no máximo dois blits cada."""
+        if not self.layers: # Nenhuma camada disponível: usa a cor de fallback
+            screen.fill(self.fallback_color)
+        for surface, factor in self.layers:
+            width = surface.get_width()
+            offset = int(camera_x * factor) % width # Repete a camada de forma contínua
+            screen.blit(surface, (-offset, 0))
+            if offset: # Preenche o espaço deixado à direita com o começo da imagem
+                screen.blit(surface, (width - offset, 0))
+
+
+class ParticleSystem:
+    """Sistema de partículas em arrays pré-alocados de capacidade fixa.
+
+    Cada atributo de partícula vive em um array numpy próprio; os índices
+    livres ficam em uma pilha (free list), então emitir e matar partículas
+    não aloca objetos. Atualização e desenho trabalham em buffers de rascunho
+    criados uma única vez (via `out=`), e o desenho junta todos os pixels
+    cobertos para fazer uma só leitura e uma só escrita na tela por frame.
+    """
+
+    def __init__(self, capacity=PARTICLE_CAPACITY, seed=None):
+        self.capacity = capacity
+        self.x = np.zeros(capacity, dtype=np.float32)
+        self.y = np.zeros(capacity, dtype=np.float32)
+        self.vx = np.zeros(capacity, dtype=np.float32)
+        self.vy = np.zeros(capacity, dtype=np.float32)
+        self.life = np.zeros(capacity, dtype=np.int32) # Frames restantes
+        self.max_life = np.ones(capacity, dtype=np.int32)
+        self.size = np.ones(capacity, dtype=np.int32)
+        self.gravity = np.zeros(capacity, dtype=np.float32) # Gravidade por partícula
+        self.color = np.zeros((capacity, 3), dtype=np.float32)
+        self.alive = np.zeros(capacity, dtype=bool)
+        # Pilha de índices livres: free_stack[:free_top] estão disponíveis
+        self.free_stack = np.arange(capacity - 1, -1, -1, dtype=np.int32)
+        self.free_top = capacity
+        self.rng = np.random.default_rng(seed)
+
+        # Buffers de rascunho reutilizados a cada frame
+        self._indices = np.arange(capacity, dtype=np.int32)
+        self._dead = np.zeros(capacity, dtype=bool)
+        self._mask = np.zeros(capacity, dtype=bool)
+        self._idx = np.zeros(capacity, dtype=np.int32) # Índices das partículas vivas
+        self._float = np.zeros(capacity, dtype=np.float32)
+        self._px = np.zeros(capacity, dtype=np.int32)
+        self._py = np.zeros(capacity, dtype=np.int32)
+        self._sizes = np.zeros(capacity, dtype=np.int32)
+        self._life = np.zeros(capacity, dtype=np.int32)
+        self._max_life = np.zeros(capacity, dtype=np.int32)
+        self._fade = np.zeros(capacity, dtype=np.float32) # Opacidade restante
+        self._keep = np.zeros(capacity, dtype=np.float32) # 1 - opacidade
+        self._colors = np.zeros((capacity, 3), dtype=np.float32) # Cor já multiplicada pela opacidade
+        # Cada partícula cobre até PARTICLE_MAX_SIZE² pixels: uma coluna por deslocamento
+        offsets = PARTICLE_MAX_SIZE * PARTICLE_MAX_SIZE
+        self._offset_x = np.tile(np.arange(PARTICLE_MAX_SIZE, dtype=np.int32), PARTICLE_MAX_SIZE)
+        self._offset_y = np.repeat(np.arange(PARTICLE_MAX_SIZE, dtype=np.int32), PARTICLE_MAX_SIZE)
+        self._owner = np.repeat(np.arange(capacity, dtype=np.int32), offsets).reshape(capacity, offsets)
+        self._cx = np.zeros((capacity, offsets), dtype=np.int32)
+        self._cy = np.zeros((capacity, offsets), dtype=np.int32)
+        self._covered = np.zeros((capacity, offsets), dtype=bool)
+        self._test = np.zeros((capacity, offsets), dtype=bool)
+        self._pixel_x = np.zeros(capacity * offsets, dtype=np.int32)
+        self._pixel_y = np.zeros(capacity * offsets, dtype=np.int32)
+        self._pixel_owner = np.zeros(capacity * offsets, dtype=np.int32)
+        self._pixel_keep = np.zeros(capacity * offsets, dtype=np.float32)
+        self._pixel_color = np.zeros((capacity * offsets, 3), dtype=np.float32)
+        self._pixel_behind = np.zeros((capacity * offsets, 3), dtype=np.float32)
+
+    @property
+    def active_count(self):
+        """Número de partículas vivas."""
+        return self.capacity - self.free_top
+
+    def clear(self):
+        """Remove todas as partículas (ex: ao trocar de nível)."""
+        self.alive[:] = False
+        self.life[:] = 0
+        self.free_stack[:] = np.arange(self.capacity - 1, -1, -1, dtype=np.int32)
+        self.free_top = self.capacity
+
+    def emit(self, x, y, count, color, speed=(1, 4), angle=(0, 2 * math.pi),
+             life=(20, 40), size=(2, PARTICLE_MAX_SIZE), gravity=PARTICLE_GRAVITY):
+        """Emite até `count` partículas a partir de (x, y).
+
+        `speed`, `angle`, `life` e `size` são intervalos (mín, máx) sorteados
+        por partícula. Se o sistema estiver cheio, emite apenas o que couber.
+        """
+        count = min(count, self.free_top)
+        if count <= 0:
+            return
+        self.free_top -= count
+        idx = self.free_stack[self.free_top:self.free_top + count] # Índices retirados da pilha
+        rng = self.rng
+
+        theta = rng.uniform(angle[0], angle[1], count)
+        magnitude = rng.uniform(speed[0], speed[1], count)
+        self.x[idx], self.y[idx] = x, y
+        self.vx[idx] = np.cos(theta) * magnitude
+        self.vy[idx] = np.sin(theta) * magnitude
+        lifetimes = rng.integers(life[0], life[1] + 1, count)
+        self.life[idx], self.max_life[idx] = lifetimes, lifetimes
+        self.size[idx] = rng.integers(size[0], min(size[1], PARTICLE_MAX_SIZE) + 1, count)
+        self.gravity[idx] = gravity
+        self.color[idx] = color
+        self.alive[idx] = True
+
+    def burst(self, center, color, count=40):
+        """Explosão radial (morte de inimigo)."""
+        self.emit(center[0], center[1], count, color,
+                  speed=(1.5, 5), life=(25, 45))
+
+    def dust(self, midbottom, count=12):
+        """Poeira levantada ao aterrissar, espalhando para os lados e para cima."""
+        self.emit(midbottom[0], midbottom[1] - 1, count, DUST_COLOR,
+                  speed=(0.5, 2), angle=(math.pi, 2 * math.pi),
+                  life=(12, 24), size=(2, 3), gravity=0.05)
+
+    def sparks(self, center, count=20):
+        """Faíscas rápidas e curtas quando o herói toma dano."""
+        self.emit(center[0], center[1], count, SPARK_COLOR,
+                  speed=(3, 7), life=(8, 16), size=(1, 2), gravity=0.4)
+
+    def update(self):
+        """Integra todas as partículas vivas e devolve as mortas à free list."""
+        if self.free_top == self.capacity: # Nada vivo, nada a fazer
+            return
+        alive, dead = self.alive, self._dead
+        np.add(self.vy, self.gravity, out=self.vy, where=alive)
+        np.add(self.x, self.vx, out=self.x, where=alive)
+        np.add(self.y, self.vy, out=self.y, where=alive)
+        np.subtract(self.life, 1, out=self.life, where=alive)
+
+        np.less_equal(self.life, 0, out=dead)
+        np.greater(self.y, HEIGHT + PARTICLE_MAX_SIZE, out=self._mask)
+        np.logical_or(dead, self._mask, out=dead)
+        np.logical_and(dead, alive, out=dead)
+        dead_count = np.count_nonzero(dead)
+        if dead_count:
+            np.logical_xor(alive, dead, out=alive) # Mortas são sempre um subconjunto das vivas
+            np.compress(dead, self._indices,
+                        out=self.free_stack[self.free_top:self.free_top + dead_count])
+            self.free_top += dead_count
+
+    def draw(self):
+        """Desenha todas as partículas vivas, misturando cada uma com a tela."""
+        count = self.active_count
+        if not count:
+            return
+        idx = np.compress(self.alive, self._indices, out=self._idx[:count])
+        px, py = self._px[:count], self._py[:count]
+        np.copyto(px, np.take(self.x, idx, out=self._float[:count], mode="clip"), casting="unsafe")
+        np.copyto(py, np.take(self.y, idx, out=self._float[:count], mode="clip"), casting="unsafe")
+        sizes = np.take(self.size, idx, out=self._sizes[:count], mode="clip")
+        fade = np.divide(np.take(self.life, idx, out=self._life[:count], mode="clip"),
+                         np.take(self.max_life, idx, out=self._max_life[:count], mode="clip"),
+                         out=self._fade[:count])
+        colors = np.take(self.color, idx, axis=0, out=self._colors[:count], mode="clip")
+
+        surface = screen.surface
+        surface_w, surface_h = surface.get_size()
+        try:
+            pixels = pygame.surfarray.pixels3d(surface) # Trava a tela para escrita direta
+        except Exception: # Formato de superfície sem acesso direto: desenha um a um
+            shrunk = np.multiply(sizes, fade, out=self._keep[:count]) # Encolhe em vez de esmaecer
+            for i in range(count):
+                side = max(1, int(shrunk[i] + 0.5))
+                surface.fill(colors[i].astype(np.uint8), (px[i], py[i], side, side))
+            return
+        try:
+            # Matriz partículas x deslocamentos: quais pixels de cada quadrado caem na tela
+            cx, cy = self._cx[:count], self._cy[:count]
+            covered, test = self._covered[:count], self._test[:count]
+            np.add(px[:, None], self._offset_x, out=cx)
+            np.add(py[:, None], self._offset_y, out=cy)
+            np.greater(sizes[:, None], self._offset_x, out=covered)
+            np.greater(sizes[:, None], self._offset_y, out=test)
+            covered &= test
+            for coords, limit in ((cx, surface_w), (cy, surface_h)):
+                np.greater_equal(coords, 0, out=test)
+                covered &= test
+                np.less(coords, limit, out=test)
+                covered &= test
+            covered = covered.ravel()
+            total = np.count_nonzero(covered)
+            pixel_x = np.compress(covered, cx.ravel(), out=self._pixel_x[:total])
+            pixel_y = np.compress(covered, cy.ravel(), out=self._pixel_y[:total])
+            owner = np.compress(covered, self._owner[:count].ravel(), out=self._pixel_owner[:total])
+
+            # Mistura com o que já está na tela: fundo * (1 - opacidade) + cor * opacidade
+            np.subtract(1, fade, out=self._keep[:count])
+            colors *= fade[:, None]
+            keep = np.take(self._keep[:count], owner, out=self._pixel_keep[:total], mode="clip")
+            blended = np.take(colors, owner, axis=0, out=self._pixel_color[:total], mode="clip")
+            behind = np.multiply(pixels[pixel_x, pixel_y], keep[:, None],
+                                 out=self._pixel_behind[:total]) # Única leitura da tela
+            blended += behind
+            pixels[pixel_x, pixel_y] = blended # Única escrita na tela
+        finally:
+            del pixels # Libera o lock da superfície
+
+
 class LevelSelector:
     """Gerencia a tela de seleção de níveis."""
 
@@ -445,7 +928,7 @@ class LevelSelector:
 # Definição dos Níveis (com plataformas aéreas menores e design mais elaborado)
 LEVELS = [
     {   # Fase 1
-        "background": "backgrounds/level1_bg",
+        "background_layers": [("backgrounds/level1_bg", 0.1)],
         "platforms": [
             (0, HEIGHT - TILE_SIZE, 8 * TILE_SIZE, TILE_SIZE, "chao_terra", "static"),
             (9 * TILE_SIZE, HEIGHT - TILE_SIZE, 8 * TILE_SIZE, TILE_SIZE, "chao_terra", "static"),
@@ -462,10 +945,10 @@ LEVELS = [
             (20 * TILE_SIZE, HEIGHT - 9 * TILE_SIZE - 32, (19 * TILE_SIZE, 22 * TILE_SIZE), "zombie"),
         ],
         "start_pos": (TILE_SIZE, HEIGHT - TILE_SIZE - HERO_HEIGHT),
-        "goal": ((18 * TILE_SIZE) + (4 * TILE_SIZE // 2) - (32 // 2), HEIGHT - 9 * TILE_SIZE - 64)
+        "goal": ((18 * TILE_SIZE) + (4 * TILE_SIZE // 2) - (GOAL_WIDTH // 2), HEIGHT - 9 * TILE_SIZE - GOAL_HEIGHT)
     },
     {   # Fase 2
-        "background": "backgrounds/level2_bg",
+        "background_layers": [("backgrounds/level2_bg", 0.1)],
         "platforms": [
             (0, HEIGHT - TILE_SIZE, WIDTH, TILE_SIZE, "chao_terra", "static"),
             (2 * TILE_SIZE, HEIGHT - 5 * TILE_SIZE, TILE_SIZE, TILE_SIZE, "plataforma_pedra", "static"),
@@ -485,10 +968,10 @@ LEVELS = [
             (17 * TILE_SIZE, HEIGHT - 6 * TILE_SIZE, (16 * TILE_SIZE, 20 * TILE_SIZE), "bat"),
         ],
         "start_pos": (TILE_SIZE, HEIGHT - TILE_SIZE - HERO_HEIGHT),
-        "goal": (20 * TILE_SIZE, HEIGHT - 14 * TILE_SIZE - 64)
+        "goal": (20 * TILE_SIZE, HEIGHT - 14 * TILE_SIZE - GOAL_HEIGHT)
     },
     {   # Fase 3
-        "background": "backgrounds/level3_bg",
+        "background_layers": [("backgrounds/level3_bg", 0.1)],
         "platforms": [
             (TILE_SIZE, HEIGHT - 3 * TILE_SIZE, 2 * TILE_SIZE, TILE_SIZE, "plataforma_pedra", "static"),
             (0, HEIGHT - TILE_SIZE, WIDTH, TILE_SIZE, "chao_terra", "static"),
@@ -513,7 +996,7 @@ LEVELS = [
             (22 * TILE_SIZE, HEIGHT - 8 * TILE_SIZE, (20 * TILE_SIZE, WIDTH - TILE_SIZE), "bat"),
         ],
         "start_pos": (1.5 * TILE_SIZE, HEIGHT - 3 * TILE_SIZE - HERO_HEIGHT), # Ajuste para caber na plataforma
-        "goal": (WIDTH - 2 * TILE_SIZE + (TILE_SIZE // 2) - (32 // 2), HEIGHT - 15 * TILE_SIZE - 64)
+        "goal": (WIDTH - 2 * TILE_SIZE + (TILE_SIZE // 2) - (GOAL_WIDTH // 2), HEIGHT - 15 * TILE_SIZE - GOAL_HEIGHT)
     }
 ]
 
@@ -523,7 +1006,14 @@ sounds_enabled, music_enabled = True, True
 current_level_index, transition_timer = 0, 0
 level_selector_obj = LevelSelector()
 hero, enemies, platforms, goal = None, [], [], None
-background_image_name, menu_background_image = None, "backgrounds/menu_bg"
+particles = ParticleSystem()
+assets, level_asset_keys_retained = AssetCache(), set()
+input_latency, pending_jump_press, show_debug = InputLatencyStats(), False, False
+ghosts, ghost_geometry, ghost_inputs = None, None, None # Lote de fantasmas da fase atual
+run_recording, best_runs, ghost_images = [], {}, {} # Ticks da corrida atual e replays por fase
+RECORDED_FIELDS = 4 # Por tick: esquerda, direita, pulo apertado, quique em inimigo
+level_background, camera_x = None, 0
+menu_background = ParallaxBackground(MENU_BACKGROUND_LAYERS, fallback_color=LIGHT_BLUE)
 menu_buttons, mouse_pos_global = [], (0, 0)
 
 
@@ -545,29 +1035,75 @@ def setup_main_menu():
         tocar_musica_com_feedback("menu_theme", volume=0.8) # Volume da música do menu aumentado
 
 
+def global_asset_keys():
+    """Recursos usados em todas as fases (herói, bandeira e sons)."""
+    keys = {("image", f"hero/{state}_{frame}")
+            for state, frame_count in HERO_ANIMATION_FRAMES.items()
+            for frame in range(frame_count)}
+    keys.update(("image", f"flags/flag_{frame}") for frame in range(GOAL_ANIMATION_FRAMES))
+    keys.update(("sound", name) for name in GAME_SOUNDS)
+    return keys
+
+
+def level_asset_keys(level_idx):
+    """Recursos específicos de uma fase: fundos, tiles e inimigos."""
+    if not 0 <= level_idx < len(LEVELS):
+        return set()
+    level_data = LEVELS[level_idx]
+    keys = {AssetCache.layer_key(image_name, opaque=(index == 0))
+            for index, (image_name, _) in enumerate(level_data["background_layers"])}
+    for p_data in level_data["platforms"]:
+        tex, p_type = p_data[4], p_data[5]
+        programmatic = tex in STATIC_PROGRAMMATIC_COLORS or \
+            (p_type != "static" and tex in MOVING_PROGRAMMATIC_COLORS)
+        if not programmatic: # Só plataformas desenhadas com tiles usam imagem
+            keys.add(("image", f"tiles/{tex}"))
+    for e_data in level_data["enemies"]:
+        enemy_type = e_data[3]
+        keys.update(("image", f"enemies/{enemy_type}_{frame}")
+                    for frame in range(ENEMY_ANIMATION_DATA[enemy_type]['frames']))
+    return keys
+
+
+def retain_level_assets(level_idx):
+    """Retém os recursos da fase atual e da próxima e libera os da anterior."""
+    global level_asset_keys_retained
+    new_keys = level_asset_keys(level_idx) | level_asset_keys(level_idx + 1)
+    assets.retain(new_keys) # Retém antes de liberar para não soltar recursos compartilhados
+    assets.release(level_asset_keys_retained)
+    level_asset_keys_retained = new_keys
+    assets.preload(level_asset_keys(level_idx)) # Evita carregar do disco no meio da fase
+
+
 def start_level(level_idx):
     """Inicia um nível específico, carregando seus dados."""
     global current_level_index, hero, enemies, platforms, goal
-    global background_image_name, game_state
+    global level_background, camera_x, game_state, pending_jump_press
 
+    retain_level_assets(level_idx)
+    pending_jump_press = False # Não carrega pulo apertado de outra tela
+    input_latency.reset() # Medições valem para a fase atual
     if level_idx >= len(LEVELS): # Se passou do último nível, jogador venceu
         game_state = VICTORY
         if music_enabled:
             music.stop()
         if sounds_enabled:
             try:
-                sounds.victory.play()
+                assets.sound("victory").play()
             except Exception: # Captura erro de som de vitória
                 print("AVISO: Som de vitória não encontrado.")
         return
 
     current_level_index, level_data = level_idx, LEVELS[level_idx] # Define nível atual
-    background_image_name = level_data["background"]
+    level_background = ParallaxBackground(level_data["background_layers"]) # Carrega camadas uma vez
+    camera_x = 0
     hero = Hero(*level_data["start_pos"]) # Cria herói
     goal = Goal(*level_data["goal"]) # Cria objetivo
 
     platforms.clear() # Limpa plataformas do nível anterior
     enemies.clear() # Limpa inimigos do nível anterior
+    particles.clear() # Descarta partículas do nível anterior
+    start_ghosts(level_idx, level_data)
 
     # Cria plataformas do nível
     for p_data in level_data["platforms"]:
@@ -591,27 +1127,96 @@ def start_level(level_idx):
         tocar_musica_com_feedback("background", volume=0.5) # Toca música de fundo do nível
 
 
+def sample_input():
+    """Lê a entrada do herói uma vez por tick e consome o pulo pendente."""
+    global pending_jump_press
+    controls = (keyboard.left, keyboard.right, pending_jump_press)
+    pending_jump_press = False
+    return controls
+
+
+def start_ghosts(level_idx, level_data):
+    """Prepara os fantasmas da fase a partir das melhores corridas gravadas."""
+    global ghosts, ghost_geometry, ghost_inputs, run_recording
+    run_recording = []
+    replays = best_runs.get(level_idx, [])
+    if not replays:
+        ghosts = None
+        return
+    # Todos os replays em um só array (fantasma, tick, esquerda/direita/pulo/quique)
+    ghost_inputs = np.zeros((len(replays), max(len(r) for r in replays), RECORDED_FIELDS), dtype=bool)
+    for i, replay in enumerate(replays):
+        ghost_inputs[i, :len(replay)] = replay
+    ghost_geometry = LevelGeometry.from_level(level_data)
+    ghosts = HeroBatch(len(replays), level_data["start_pos"])
+
+
+def step_ghosts():
+    """Avança todos os fantasmas um tick, em lote, com as plataformas atuais."""
+    if ghosts is None:
+        return
+    tick = min(ghosts.ticks, ghost_inputs.shape[1] - 1)
+    left, right, jump_pressed, bounce = ghost_inputs[:, tick].T
+    if ghosts.ticks >= ghost_inputs.shape[1]: # Replays acabaram: fantasmas param
+        left = right = jump_pressed = bounce = np.zeros(ghosts.count, dtype=bool)
+    ghost_geometry.sync(platforms)
+    ghosts.step(left, right, jump_pressed, ghost_geometry, bounce)
+
+
+def save_run(level_idx):
+    """Guarda a corrida que acabou de completar a fase entre as mais rápidas."""
+    replays = best_runs.setdefault(level_idx, [])
+    replays.append(np.array(run_recording, dtype=bool).reshape(-1, RECORDED_FIELDS))
+    replays.sort(key=len)
+    del replays[GHOST_REPLAY_LIMIT:]
+
+
+def draw_ghosts():
+    """Desenha todos os fantasmas semitransparentes em uma única chamada."""
+    if ghosts is None:
+        return
+    if not ghost_images: # Cópias translúcidas, para não alterar as imagens do herói
+        for name in ("hero/idle_0", "hero/jump_0"):
+            try:
+                ghost_images[name] = assets.image(name).copy()
+            except Exception: # Fallback se a imagem não for encontrada
+                ghost_images[name] = pygame.Surface((HERO_WIDTH, HERO_HEIGHT))
+                ghost_images[name].fill(WHITE)
+            ghost_images[name].set_alpha(GHOST_ALPHA)
+    idle, jumping = ghost_images["hero/idle_0"], ghost_images["hero/jump_0"]
+    active = ghosts.active
+    screen.surface.blits(
+        [(idle if on_ground else jumping, (x, y)) for x, y, on_ground in
+         zip(ghosts.x[active], ghosts.y[active], ghosts.on_ground[active])],
+        doreturn=False
+    )
+
+
 def update(dt):
     """Função de atualização principal do jogo, chamada a cada frame."""
-    global game_state, current_level_index, transition_timer
+    global game_state, current_level_index, transition_timer, camera_x
 
     if game_state == MENU:
+        camera_x += MENU_SCROLL_SPEED # Fundo do menu rola sozinho
         for btn in menu_buttons: # Atualiza hover dos botões do menu
             btn.update_hover(mouse_pos_global)
     elif game_state == LEVEL_SELECT:
         level_selector_obj.update_buttons_hover(mouse_pos_global) # Hover da seleção de nível
     elif game_state == PLAYING:
         if hero: # Atualiza herói se existir
-            if hero.update(platforms, goal) and game_state == PLAYING: # Se herói alcançou objetivo
+            controls = sample_input() # Entrada lida em um ponto fixo do tick
+            run_recording.append([*controls, False]) # Gravada para virar fantasma; quique marcado abaixo
+            if hero.update(platforms, goal, controls) and game_state == PLAYING: # Se herói alcançou objetivo
                 game_state, transition_timer = LEVEL_TRANSITION, FPS * 2 # Inicia transição
+                save_run(current_level_index)
                 if music_enabled:
                     music.fadeout(1) # Música some gradualmente
                 if sounds_enabled:
                     try:
-                        sounds.level_complete.play()
+                        assets.sound("level_complete").play()
                     except Exception: # Captura erro de som de nível completo
                         print("AVISO: Som nível completo com erro.")
-            if hero.rect.top > HEIGHT + 100: # Se herói caiu da tela
+            if hero.rect.top > FALL_LIMIT: # Se herói caiu da tela
                 hero.health = 0
                 hero.take_damage()
 
@@ -623,10 +1228,14 @@ def update(dt):
                     if (hero.velocity > 0 and
                             hero.rect.bottom < enemy.rect.centery + 5): # Pequena margem
                         enemy.take_damage() # Inimigo morre
-                        hero.velocity = hero.jump_power * 0.6 # Pequeno impulso para cima
+                        hero.velocity = hero.jump_power * HERO_STOMP_BOUNCE # Pequeno impulso para cima
+                        run_recording[-1][3] = True # Fantasma repete o quique neste tick
                         hero.on_ground = False # Garante que não está mais no chão
+                        hero.coyote_timer = 0 # O impulso não conta como chão para pular
                     else: # Colisão lateral ou por baixo
                         hero.take_damage() # Herói toma dano
+            camera_x = hero.rect.centerx - WIDTH // 2 # Câmera centrada no herói
+        step_ghosts() # Antes das plataformas se moverem, como o herói
         if goal: # Atualiza objetivo (animação)
             goal.update()
         # Atualiza plataformas móveis e inimigos vivos
@@ -634,6 +1243,7 @@ def update(dt):
             if isinstance(item, MovingPlatform) or \
                (isinstance(item, Enemy) and item.alive):
                 item.update()
+        particles.update()
         if hero and hero.health <= 0 and game_state != GAME_OVER: # Se vida do herói acabou
             game_state = GAME_OVER
             if music_enabled:
@@ -648,12 +1258,12 @@ def update(dt):
 
 def draw_playing_state():
     """Desenha os elementos da tela de jogo (estado PLAYING)."""
-    try:
-        screen.blit(background_image_name or "", (0, 0)) # "" para evitar erro se None
-    except Exception:
+    if level_background:
+        level_background.draw(camera_x)
+    else:
         screen.fill(BLACK)
 
-    # Ordem de desenho: plataformas, inimigos, objetivo, herói
+    # Ordem de desenho: plataformas, inimigos, objetivo, fantasmas, herói
     for item in platforms:
         item.draw()
     for enemy_item in enemies:
@@ -661,23 +1271,27 @@ def draw_playing_state():
             enemy_item.draw()
     if goal:
         goal.draw()
+    draw_ghosts()
     if hero:
         hero.draw()
+    particles.draw() # Todas as partículas de uma vez, sobre o que já foi desenhado
 
     if hero: # Desenha HUD de vida
         screen.draw.text(
             f"Vida: {hero.health}", (10, 10),
             fontsize=30, color=WHITE, owidth=1, ocolor=BLACK
         )
+    if show_debug: # HUD de depuração (F3)
+        screen.draw.text(
+            input_latency.summary(), (10, 45),
+            fontsize=20, color=WHITE, owidth=1, ocolor=BLACK
+        )
 
 
 def draw():
     """Função principal para desenhar tudo na tela, chamada a cada frame."""
     if game_state == MENU:
-        try:
-            screen.blit(menu_background_image, (0, 0))
-        except Exception: # Fallback se imagem do menu não carregar
-            screen.fill(LIGHT_BLUE)
+        menu_background.draw(camera_x) # Cor de fallback se a imagem do menu não existir
         screen.draw.text(
             "GamePlat", center=(WIDTH // 2, HEIGHT // 4),
             fontsize=60, color=WHITE, owidth=1.5, ocolor=BLACK
@@ -733,10 +1347,12 @@ def draw():
 
 def on_key_down(key):
     """Lida com eventos de teclas pressionadas."""
-    global game_state, current_level_index
+    global game_state, current_level_index, pending_jump_press, show_debug
 
-    if game_state == PLAYING and hero and (key == keys.SPACE or key == keys.UP):
-        hero.jump() # Pulo
+    if key == keys.F3: # Liga/desliga o HUD de depuração
+        show_debug = not show_debug
+    elif game_state == PLAYING and hero and (key == keys.SPACE or key == keys.UP):
+        pending_jump_press = True # Pulo é consumido no próximo update()
     elif game_state == GAME_OVER:
         if key == keys.R: # Reiniciar
             start_level(current_level_index)
@@ -792,5 +1408,6 @@ def on_mouse_move(pos):
 
 
 # Inicialização do Jogo
+assets.retain(global_asset_keys()) # Herói, bandeira e sons ficam sempre carregados
 setup_main_menu() # Configura o menu ao iniciar
 pgzrun.go() # Inicia o loop principal do Pygame Zero
\ No newline at end of file
@@ -0,0 +1,105 @@
+"""Confere, sem abrir o jogo, que as fases geradas podem ser completadas.
+
+Para cada semente faz uma busca de alcançabilidade com HeroBatch: a partir de
+cada plataforma já alcançada, simula em lote heróis saindo de vários pontos
+dela, em vários momentos do ciclo das plataformas móveis, com entradas
+simples (segurar esquerda ou direita por alguns ticks, pulando ou não no
+começo). A fase passa se algum herói tocar a bandeira. Inimigos são
+ignorados, como em HeroBatch.
+
+Uso (de dentro de GamePlat):
+    python check_levels.py           # sementes 0 a 29
+    python check_levels.py 100 50    # 50 sementes a partir da 100
+"""
+import sys
+
+import numpy as np
+
+from hero_batch import HeroBatch, LevelGeometry
+from level_generator import generate_level
+from settings import HERO_WIDTH, HERO_HEIGHT
+
+KNOB_SETS = ({}, {"density": 0}, {"moving_ratio": 0.6}) # Padrão, vãos no limite, muitas móveis
+HOLD_TICKS = np.arange(0, 61, 4) # Por quantos ticks a direção fica apertada
+START_STEP = 8 # Distância (px) entre pontos de partida sobre uma plataforma
+PHASE_STEP = 16 # Distância (ticks) entre momentos testados do ciclo das plataformas móveis
+MAX_TICKS = 150 # Duração máxima de cada salto simulado
+
+
+def cycle_ticks(geometry):
+    """Duração de um ciclo completo das plataformas móveis (0 se não houver)."""
+    moving = geometry.moving
+    if not moving.any():
+        return 0
+    return int(np.ceil((2 * geometry.move_range[moving] / geometry.speed[moving]).max()))
+
+
+def hops_from(level, source, phase):
+    """Simula saídas da plataforma `source` no tick `phase` do ciclo.
+
+    Devolve (índices das plataformas onde algum herói aterrissou, se algum
+    herói alcançou a bandeira).
+    """
+    geometry = LevelGeometry.from_level(level)
+    for _ in range(phase):
+        geometry.step()
+    left, top, width = geometry.left[source], geometry.top[source], geometry.width[source]
+
+    # Uma linha por combinação de ponto de partida, direção, tempo segurando e pulo
+    starts = np.arange(left - HERO_WIDTH + 4, left + width - 4, START_STEP)
+    start_x, go_right, hold, jump = (a.ravel() for a in np.meshgrid(
+        starts, [False, True], HOLD_TICKS, [False, True], indexing="ij"))
+    batch = HeroBatch(start_x.size, (0, top - HERO_HEIGHT))
+    batch.x[:] = start_x
+    batch.on_ground[:] = True
+
+    landed_on = np.full(batch.count, -1)
+    airborne = np.zeros(batch.count, dtype=bool)
+    for tick in range(MAX_TICKS):
+        holding = hold > tick
+        batch.step(holding & ~go_right, holding & go_right, jump & (tick == 0), geometry)
+        airborne |= ~batch.on_ground
+        landing = airborne & batch.on_ground & (landed_on < 0)
+        if landing.any(): # Plataforma sob os pés de quem acabou de aterrissar
+            x, bottom = batch.x[landing, None], batch.y[landing, None] + HERO_HEIGHT
+            under = ((geometry.top[None, :] == bottom) & (x < geometry.left + geometry.width) &
+                     (x + HERO_WIDTH > geometry.left))
+            landed_on[landing] = np.where(under.any(axis=1), under.argmax(axis=1), source)
+        geometry.step()
+        if not (batch.active & (landed_on < 0)).any():
+            break
+    return set(landed_on[landed_on >= 0].tolist()), bool(batch.finished.any())
+
+
+def check_level(level):
+    """Busca em largura pelas plataformas; devolve (completável, alcançadas)."""
+    phases = range(0, max(1, cycle_ticks(LevelGeometry.from_level(level))), PHASE_STEP)
+    reached, frontier = {0}, [0] # A primeira plataforma é a de partida
+    while frontier:
+        source = frontier.pop()
+        for phase in phases:
+            targets, finished = hops_from(level, source, phase)
+            if finished:
+                return True, reached
+            for target in targets - reached:
+                reached.add(target)
+                frontier.append(target)
+    return False, reached
+
+
+def main(first_seed=0, count=30):
+    failures = 0
+    for seed in range(first_seed, first_seed + count):
+        for knobs in KNOB_SETS:
+            level = generate_level(seed, **knobs)
+            completable, reached = check_level(level)
+            if not completable:
+                failures += 1
+                print(f"FALHA semente {seed} {knobs}: bandeira inalcançável, "
+                      f"plataformas alcançadas {sorted(reached)} de {len(level['platforms'])}")
+    print(f"{count * len(KNOB_SETS) - failures} de {count * len(KNOB_SETS)} fases completáveis")
+    return failures
+
+
+if __name__ == "__main__":
+    sys.exit(1 if main(*(int(arg) for arg in sys.argv[1:])) else 0)
@@ -0,0 +1,190 @@
+"""Simulação em lote de vários heróis na mesma fase.
+
+Posições, velocidades e flags de chão de todos os heróis ficam em arrays
+numpy, e a colisão com as plataformas é resolvida em uma única passada
+vetorizada por tick. Serve para fantasmas (replays) no jogo e para treinar ou
+avaliar centenas de agentes no mesmo processo, sem abrir a janela do jogo.
+
+A física reproduz Hero.update e Hero.jump (Game.py), inclusive buffer de pulo
+e coyote time. Inimigos não fazem parte do lote: os heróis simulados os
+atravessam, e o quique ao pisar em um inimigo só acontece quando é pedido
+em `bounce` (ex: fantasmas repetindo o quique gravado na corrida).
+
+Exemplo (sem janela):
+    geometry = LevelGeometry.from_level(fase)
+    batch = HeroBatch(500, fase["start_pos"])
+    while batch.active.any():
+        batch.step(left, right, jump, geometry)  # Arrays bool de tamanho 500
+        geometry.step()
+"""
+import numpy as np
+
+from settings import (
+    HERO_WIDTH, HERO_HEIGHT, HERO_JUMP_POWER, HERO_GRAVITY, HERO_MAX_FALL_SPEED,
+    HERO_SPEED, HERO_STOMP_BOUNCE, FALL_LIMIT, JUMP_BUFFER_FRAMES, COYOTE_FRAMES, GOAL_WIDTH,
+    GOAL_HEIGHT
+)
+
+
+def round_like_rect(values):
+    """Arredonda como um Rect do Pygame (metade para longe do zero)."""
+    return np.sign(values) * np.floor(np.abs(values) + 0.5)
+
+
+class LevelGeometry:
+    """Plataformas e objetivo de uma fase em arrays, com plataformas móveis."""
+
+    def __init__(self, platform_data, goal_pos):
+        count = len(platform_data)
+        self.left = np.zeros(count)
+        self.top = np.zeros(count)
+        self.width = np.zeros(count)
+        self.height = np.zeros(count)
+        self.moving = np.zeros(count, dtype=bool)
+        self.vertical = np.zeros(count, dtype=bool)
+        self.speed = np.zeros(count)
+        self.move_range = np.zeros(count)
+        self.direction = np.ones(count)
+        for i, p_data in enumerate(platform_data):
+            x, y, w, h, _, p_type = p_data[:6]
+            self.left[i], self.top[i], self.width[i], self.height[i] = x, y, w, h
+            if p_type in ("moving_h", "moving_v"):
+                self.moving[i], self.vertical[i] = True, p_type == "moving_v"
+                self.move_range[i], self.speed[i] = p_data[6], p_data[7]
+        self.origin_left, self.origin_top = self.left.copy(), self.top.copy()
+        self.goal = (goal_pos[0], goal_pos[1], GOAL_WIDTH, GOAL_HEIGHT)
+
+    @classmethod
+    def from_level(cls, level_data):
+        """Cria a geometria a partir de um dicionário no formato de LEVELS."""
+        return cls(level_data["platforms"], level_data["goal"])
+
+    def sync(self, platforms):
+        """Copia posições e direções das plataformas do jogo (objetos com .rect)."""
+        for i, p in enumerate(platforms):
+            self.left[i], self.top[i] = p.rect.x, p.rect.y
+            if self.moving[i]:
+                self.direction[i] = p.direction
+
+    def carry(self):
+        """Deslocamento em x que cada plataforma aplica a quem está em cima.
+
+        Como em Hero.update, vale para toda plataforma móvel, inclusive as
+        verticais.
+        """
+        return np.where(self.moving, self.speed * self.direction, 0)
+
+    def step(self):
+        """Move as plataformas móveis (mesma regra de MovingPlatform.update)."""
+        pos = np.where(self.vertical, self.top, self.left)
+        origin = np.where(self.vertical, self.origin_top, self.origin_left)
+        pos = np.where(self.moving, round_like_rect(pos + self.speed * self.direction), pos)
+        past_end = self.moving & (self.direction == 1) & (pos >= origin + self.move_range)
+        past_start = self.moving & (self.direction == -1) & (pos <= origin)
+        pos = np.where(past_end, origin + self.move_range, np.where(past_start, origin, pos))
+        self.direction = np.where(past_end, -1, np.where(past_start, 1, self.direction))
+        self.top = np.where(self.vertical, pos, self.top)
+        self.left = np.where(self.vertical, self.left, pos)
+
+
+class HeroBatch:
+    """Vários heróis avançando juntos, um tick por chamada de `step`."""
+
+    def __init__(self, count, start_pos, jump_buffer_frames=JUMP_BUFFER_FRAMES,
+                 coyote_frames=COYOTE_FRAMES):
+        self.count = count
+        self.jump_buffer_frames, self.coyote_frames = jump_buffer_frames, coyote_frames
+        self.x = np.full(count, float(round_like_rect(start_pos[0])))
+        self.y = np.full(count, float(round_like_rect(start_pos[1])))
+        self.velocity = np.zeros(count)
+        self.facing = np.ones(count, dtype=np.int8)
+        self.on_ground = np.zeros(count, dtype=bool)
+        self.jump_buffer = np.zeros(count, dtype=np.int32)
+        self.coyote_timer = np.zeros(count, dtype=np.int32)
+        self.finished = np.zeros(count, dtype=bool) # Alcançou o objetivo
+        self.dead = np.zeros(count, dtype=bool) # Caiu da tela
+        self.finish_tick = np.full(count, -1, dtype=np.int32)
+        self.ticks = 0
+
+    @property
+    def active(self):
+        """Heróis que ainda estão correndo."""
+        return ~(self.finished | self.dead)
+
+    def step(self, left, right, jump_pressed, geometry, bounce=None):
+        """Avança um tick. `left`, `right` e `jump_pressed` são arrays bool (count,).
+
+        `bounce` (opcional, bool (count,)) aplica, no fim do tick, o quique de
+        quem pisou em um inimigo, como update() em Game.py.
+        """
+        active = self.active
+        left, right = left & active, right & active & ~left
+        self.ticks += 1
+
+        # Pulo apertado no chão (ou no coyote time) sai antes da física, como em Hero.update
+        pressed = jump_pressed & active
+        self.jump_buffer = np.where(pressed, self.jump_buffer_frames, self.jump_buffer)
+        self._jump(pressed)
+
+        # Movimento horizontal e gravidade
+        self.facing = np.where(left, -1, np.where(right, 1, self.facing)).astype(np.int8)
+        self.x += np.where(left, -HERO_SPEED, np.where(right, HERO_SPEED, 0))
+        self.velocity = np.where(active, np.minimum(self.velocity + HERO_GRAVITY,
+                                                    HERO_MAX_FALL_SPEED), self.velocity)
+        self.y = np.where(active, round_like_rect(self.y + self.velocity), self.y)
+
+        # Colisão com todas as plataformas de uma vez: matriz heróis x plataformas
+        hero_left, hero_top = self.x[:, None], self.y[:, None]
+        hero_right, hero_bottom = hero_left + HERO_WIDTH, hero_top + HERO_HEIGHT
+        p_left, p_top = geometry.left[None, :], geometry.top[None, :]
+        p_right = p_left + geometry.width[None, :]
+        p_bottom = p_top + geometry.height[None, :]
+        overlap = (active[:, None] & (hero_left < p_right) & (hero_right > p_left) &
+                   (hero_top < p_bottom) & (hero_bottom > p_top))
+        falling = overlap & (self.velocity[:, None] > 0) & (hero_top < p_top)
+        hitting_head = overlap & (self.velocity[:, None] < 0) & (hero_bottom > p_bottom)
+
+        landed = falling.any(axis=1)
+        bumped = hitting_head.any(axis=1) & ~landed
+        landing_top = np.where(falling, p_top, np.inf).min(axis=1)
+        ceiling = np.where(hitting_head, p_bottom, -np.inf).max(axis=1)
+        self.y = np.where(landed, landing_top - HERO_HEIGHT,
+                          np.where(bumped, ceiling, self.y))
+        self.velocity = np.where(landed | bumped, 0, self.velocity)
+        self.on_ground = np.where(active, landed, self.on_ground)
+
+        # Plataformas móveis carregam quem está em cima
+        carry = (overlap * geometry.carry()[None, :]).sum(axis=1)
+        self.x = np.where(landed, round_like_rect(self.x + carry), self.x)
+
+        self.coyote_timer = np.where(self.on_ground, self.coyote_frames,
+                                     np.maximum(self.coyote_timer - 1, 0))
+
+        # Pulo em buffer: tenta depois das colisões, para pular no tick em que aterrissa
+        buffered = active & (self.jump_buffer > 0)
+        jumped = self._jump(buffered)
+        self.jump_buffer -= buffered & ~jumped
+
+        # Objetivo e queda
+        gx, gy, gw, gh = geometry.goal
+        reached = active & (self.x < gx + gw) & (self.x + HERO_WIDTH > gx) & \
+            (self.y < gy + gh) & (self.y + HERO_HEIGHT > gy)
+        self.finish_tick = np.where(reached, self.ticks, self.finish_tick)
+        self.finished |= reached
+        self.dead |= active & ~reached & (self.y > FALL_LIMIT)
+
+        # Quique em inimigo: depois de todo o movimento do herói, como em update()
+        if bounce is not None:
+            bouncing = bounce & self.active
+            self.velocity = np.where(bouncing, HERO_JUMP_POWER * HERO_STOMP_BOUNCE, self.velocity)
+            self.on_ground &= ~bouncing
+            self.coyote_timer = np.where(bouncing, 0, self.coyote_timer)
+
+    def _jump(self, wanting):
+        """Faz pular quem quer e pode (no chão ou no coyote time), como Hero.jump."""
+        jumping = wanting & (self.on_ground | (self.coyote_timer > 0))
+        self.velocity = np.where(jumping, HERO_JUMP_POWER, self.velocity)
+        self.on_ground &= ~jumping
+        self.coyote_timer = np.where(jumping, 0, self.coyote_timer)
+        self.jump_buffer = np.where(jumping, 0, self.jump_buffer)
+        return jumping
@@ -0,0 +1,239 @@
+"""Gerador procedural de fases no mesmo formato de `LEVELS` (Game.py).
+
+Não depende do Pygame, então pode ser importado por benchmarks e testes de
+longa duração sem abrir a janela do jogo. As fases são montadas em pedaços
+(chunks) produzidos sob demanda por `generate_chunks`; `generate_level` junta
+os pedaços em um dicionário no formato de `LEVELS`, que pode ser acrescentado
+à lista. Uma fase com `num_chunks` pedaços ocupa `num_chunks * chunk_width`
+pixels; como a tela não rola, só cabe na tela com os padrões
+(2 pedaços de CHUNK_WIDTH). O script check_levels.py confere que as fases
+geradas podem ser completadas.
+
+Exemplo:
+    fase = generate_level(seed=42, num_chunks=2, density=0.6)
+    for chunk in generate_chunks(seed=7):  # Infinito: consome só o necessário
+        ...
+"""
+import random
+
+from settings import (
+    WIDTH, HEIGHT, TILE_SIZE, HERO_HEIGHT, HERO_JUMP_POWER, HERO_GRAVITY,
+    HERO_MAX_FALL_SPEED, HERO_SPEED, GOAL_WIDTH, GOAL_HEIGHT
+)
+
+ENEMY_HEIGHT = 32
+
+JUMP_SAFETY = 0.8 # Fração do alcance teórico usada, para sobrar margem ao jogador
+CHUNK_WIDTH = WIDTH // 2 # Largura de cada pedaço gerado
+FLOOR_Y = HEIGHT - TILE_SIZE # Topo da plataforma mais baixa (linha 0)
+MAX_ROW = 13 # Linha mais alta; deixa 4 tiles livres no topo para a bandeira e o pulo
+MAX_DROP_ROWS = 6 # Maior descida entre plataformas seguidas, em tiles
+GOAL_PLATFORM_TILES = 3 # Largura da plataforma da bandeira
+GOAL_ROOM = (1 + GOAL_PLATFORM_TILES) * TILE_SIZE # Espaço reservado no fim da fase: vão mínimo + plataforma da bandeira
+
+STATIC_TEXTURES = ("plataforma_madeira", "plataforma_metal")
+MOVING_TEXTURE = "plataforma_metal"
+START_TEXTURE = "chao_terra"
+BACKGROUNDS = ("backgrounds/level1_bg", "backgrounds/level2_bg", "backgrounds/level3_bg")
+DEFAULT_ENEMY_MIX = {'zombie': 1, 'ice': 1, 'bat': 1}
+WALKING_ENEMIES = ('zombie', 'ice')
+
+
+def jump_apex(jump_power=HERO_JUMP_POWER, gravity=HERO_GRAVITY):
+    """Altura máxima (px) que o herói alcança acima do ponto de partida."""
+    height, velocity = 0, jump_power
+    while velocity < 0:
+        height -= velocity
+        velocity += gravity
+    return height
+
+
+def jump_distance(rise, jump_power=HERO_JUMP_POWER, gravity=HERO_GRAVITY,
+                  max_fall_speed=HERO_MAX_FALL_SPEED, speed=HERO_SPEED):
+    """Distância horizontal percorrida até o pulo voltar à altura `rise`.
+
+    `rise` é positivo para cima (plataforma de destino mais alta) e negativo
+    para baixo. Devolve None se a altura nunca é alcançada. Simula quadro a
+    quadro a mesma integração de Hero.update e Hero.jump.
+    """
+    if rise > jump_apex(jump_power, gravity):
+        return None
+    height, velocity, frames = 0, jump_power, 0
+    while True:
+        velocity = min(velocity + gravity, max_fall_speed)
+        height -= velocity
+        frames += 1
+        if velocity > 0 and height <= rise: # Descendo e cruzou a altura do destino
+            return frames * speed
+
+
+# Subida máxima segura entre plataformas, em tiles
+MAX_RISE_ROWS = int(JUMP_SAFETY * jump_apex()) // TILE_SIZE
+
+
+def max_gap_tiles(rise_rows):
+    """Maior vão (em tiles) seguro para um pulo que sobe `rise_rows` tiles."""
+    distance = jump_distance(rise_rows * TILE_SIZE)
+    if distance is None:
+        return 0
+    return int(JUMP_SAFETY * distance) // TILE_SIZE
+
+
+def row_to_y(row):
+    """Topo (px) de uma plataforma na linha `row` (0 = chão)."""
+    return FLOOR_Y - row * TILE_SIZE
+
+
+def _validate_knobs(num_chunks, density, moving_ratio, enemy_chance, enemy_mix):
+    if num_chunks is not None and num_chunks < 1:
+        raise ValueError(f"num_chunks deve ser None ou pelo menos 1, recebido {num_chunks}")
+    for name, value in (("density", density), ("moving_ratio", moving_ratio),
+                        ("enemy_chance", enemy_chance)):
+        if not 0 <= value <= 1:
+            raise ValueError(f"{name} deve estar entre 0 e 1, recebido {value}")
+    for enemy_type, weight in enemy_mix.items():
+        if enemy_type not in DEFAULT_ENEMY_MIX:
+            raise ValueError(f"Tipo de inimigo desconhecido: '{enemy_type}'")
+        if weight < 0:
+            raise ValueError(f"Peso negativo para '{enemy_type}'")
+
+
+def generate_chunks(seed=None, num_chunks=None, density=0.5, moving_ratio=0.2,
+                    enemy_mix=None, enemy_chance=0.4, chunk_width=CHUNK_WIDTH):
+    """Gera a fase pedaço por pedaço, sob demanda.
+
+    Cada pedaço é um dicionário com "index", "platforms", "enemies" e "goal"
+    (None, exceto no último). O primeiro traz também "start_pos". Sem
+    `num_chunks` o gerador é infinito e nunca coloca a bandeira. Com
+    `num_chunks`, nada passa de `num_chunks * chunk_width` pixels (plataformas
+    móveis incluindo todo o percurso); se faltar espaço, os últimos pedaços
+    saem com menos plataformas.
+
+    Parâmetros:
+        density: 0 deixa os vãos no limite seguro do pulo, 1 os deixa mínimos.
+        moving_ratio: chance de cada plataforma ser móvel.
+        enemy_mix: pesos por tipo de inimigo (ex: {'zombie': 2, 'bat': 1}).
+        enemy_chance: chance de uma plataforma estática receber um inimigo.
+    """
+    enemy_mix = DEFAULT_ENEMY_MIX if enemy_mix is None else enemy_mix
+    _validate_knobs(num_chunks, density, moving_ratio, enemy_chance, enemy_mix)
+    # Valida já na chamada; os pedaços só são gerados quando consumidos
+    return _chunks(seed, num_chunks, density, moving_ratio, enemy_mix,
+                   enemy_chance, chunk_width)
+
+
+def _chunks(seed, num_chunks, density, moving_ratio, enemy_mix, enemy_chance,
+            chunk_width):
+    enemy_types = [t for t, w in enemy_mix.items() if w > 0]
+    enemy_weights = [enemy_mix[t] for t in enemy_types]
+    rng = random.Random(seed)
+
+    # Plataforma inicial larga, no chão
+    start_width = 4 * TILE_SIZE
+    cursor_x, cursor_row = start_width, 0 # Borda direita e linha de saída da última plataforma
+    first_platform = (0, FLOOR_Y, start_width, TILE_SIZE, START_TEXTURE, "static")
+
+    level_end = None if num_chunks is None else num_chunks * chunk_width
+    max_right = None if level_end is None else level_end - GOAL_ROOM # Sobra espaço para a bandeira
+    index = 0
+    while num_chunks is None or index < num_chunks:
+        chunk_end = (index + 1) * chunk_width
+        platforms = [first_platform] if index == 0 else []
+        enemies = []
+
+        while cursor_x < chunk_end:
+            placed = _next_platform(rng, cursor_x, cursor_row, density, moving_ratio, max_right)
+            if placed is None: # Fim da fase: não cabe mais nenhuma plataforma
+                break
+            platform, cursor_x, cursor_row = placed
+            platforms.append(platform)
+            if platform[5] == "static" and enemy_types and \
+                    rng.random() < enemy_chance:
+                enemy_type = rng.choices(enemy_types, enemy_weights)[0]
+                enemies.append(_enemy_on(platform, enemy_type))
+
+        chunk = {"index": index, "platforms": platforms, "enemies": enemies, "goal": None}
+        if index == 0:
+            chunk["start_pos"] = (TILE_SIZE, FLOOR_Y - HERO_HEIGHT)
+        if num_chunks is not None and index == num_chunks - 1: # Último pedaço: bandeira
+            goal_platform, _, _ = _next_platform(rng, cursor_x, cursor_row, density, 0, level_end,
+                                                 width_tiles=(GOAL_PLATFORM_TILES, GOAL_PLATFORM_TILES))
+            platforms.append(goal_platform)
+            gx, gy, gw = goal_platform[:3]
+            chunk["goal"] = (gx + gw // 2 - GOAL_WIDTH // 2, gy - GOAL_HEIGHT)
+        yield chunk
+        index += 1
+
+
+def _next_platform(rng, cursor_x, cursor_row, density, moving_ratio, max_right=None,
+                   width_tiles=(2, 4)):
+    """Sorteia a próxima plataforma alcançável a partir da anterior.
+
+    Devolve (dados da plataforma, nova borda direita, nova linha de saída).
+    Com `max_right`, encurta vão, largura e percurso para a plataforma
+    terminar antes dessa borda, e devolve None se nem a menor couber.
+    """
+    rise_rows = rng.randint(-min(cursor_row, MAX_DROP_ROWS),
+                            min(MAX_ROW - cursor_row, MAX_RISE_ROWS))
+    entry_row = cursor_row + rise_rows
+
+    gap_limit = max(1, max_gap_tiles(rise_rows))
+    gap_tiles = max(1, round(gap_limit - density * (gap_limit - 1))) # Densidade encurta os vãos
+    gap_tiles = rng.randint(max(1, gap_tiles - 1), gap_tiles)
+    width_count = rng.randint(*width_tiles)
+    room_tiles = None if max_right is None else (max_right - cursor_x) // TILE_SIZE
+    if room_tiles is not None: # Vãos menores continuam alcançáveis; só encurta
+        if room_tiles < 1 + width_tiles[0]:
+            return None
+        gap_tiles = min(gap_tiles, room_tiles - width_tiles[0])
+        width_count = min(width_count, room_tiles - gap_tiles)
+        room_tiles -= gap_tiles + width_count # O que sobra para o percurso de uma plataforma móvel
+    x = cursor_x + gap_tiles * TILE_SIZE
+    width = width_count * TILE_SIZE
+
+    if rng.random() < moving_ratio:
+        range_rows = rng.randint(2, 4)
+        speed = rng.choice((1, 1.5, 2))
+        if entry_row + range_rows <= MAX_ROW and rng.random() < 0.5:
+            # Entra-se no ponto mais baixo e sai-se do mais alto (basta esperar)
+            top_row = entry_row + range_rows
+            platform = (x, row_to_y(top_row), width, TILE_SIZE, MOVING_TEXTURE,
+                        "moving_v", range_rows * TILE_SIZE, speed)
+            return platform, x + width, top_row
+        # Horizontal: entra-se na posição inicial e sai-se na mais à direita
+        if room_tiles is not None:
+            range_rows = min(range_rows, room_tiles)
+        if range_rows: # Sem espaço para o percurso, vira plataforma estática
+            move_range = range_rows * TILE_SIZE
+            platform = (x, row_to_y(entry_row), width, TILE_SIZE, MOVING_TEXTURE,
+                        "moving_h", move_range, speed)
+            return platform, x + move_range + width, entry_row
+
+    platform = (x, row_to_y(entry_row), width, TILE_SIZE,
+                rng.choice(STATIC_TEXTURES), "static")
+    return platform, x + width, entry_row
+
+
+def _enemy_on(platform, enemy_type):
+    """Cria um inimigo patrulhando sobre (ou acima de) uma plataforma estática."""
+    x, y, width = platform[:3]
+    if enemy_type in WALKING_ENEMIES:
+        return (x, y - ENEMY_HEIGHT, (x, x + width), enemy_type)
+    # Morcego voa acima da plataforma, alto o bastante para o herói passar andando por baixo
+    return (x, y - 4 * TILE_SIZE, (x, x + width), enemy_type)
+
+
+def generate_level(seed=None, num_chunks=2, **knobs):
+    """Monta uma fase completa no formato de `LEVELS` a partir dos pedaços."""
+    level = {
+        "background_layers": [(random.Random(seed).choice(BACKGROUNDS), 0.1)],
+        "platforms": [], "enemies": [], "start_pos": None, "goal": None
+    }
+    for chunk in generate_chunks(seed, num_chunks=num_chunks, **knobs):
+        level["platforms"].extend(chunk["platforms"])
+        level["enemies"].extend(chunk["enemies"])
+        if "start_pos" in chunk:
+            level["start_pos"] = chunk["start_pos"]
+        if chunk["goal"] is not None:
+            level["goal"] = chunk["goal"]
+    return level
@@ -0,0 +1,26 @@
+"""Constantes compartilhadas pelo jogo (Game.py), pelo gerador de fases
+(level_generator.py) e pela simulação em lote (hero_batch.py).
+
+Não depende do Pygame. Qualquer valor que mais de um desses módulos precise
+conhecer é definido aqui uma única vez.
+"""
+
+# Tela e grade
+WIDTH, HEIGHT = 800, 600
+TILE_SIZE = 32
+
+# Tamanho e física do herói
+HERO_WIDTH, HERO_HEIGHT = 32, 32
+HERO_JUMP_POWER = -15
+HERO_GRAVITY = 0.6
+HERO_MAX_FALL_SPEED = 10
+HERO_SPEED = 5
+HERO_STOMP_BOUNCE = 0.6 # Fração da força do pulo no quique ao pisar em um inimigo
+FALL_LIMIT = HEIGHT + 100 # Herói com o topo abaixo disso caiu da tela e morre
+
+# Entrada
+JUMP_BUFFER_FRAMES = 6 # Frames em que um pulo apertado cedo demais continua valendo
+COYOTE_FRAMES = 6 # Frames em que ainda dá para pular depois de sair de uma plataforma
+
+# Objetivo
+GOAL_WIDTH, GOAL_HEIGHT = 32, 64 # Hitbox da bandeira